@@ -1,32 +1,80 @@
+import hashlib
+import http.cookiejar
 import json
 import os
 import re
 import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from io import BytesIO
+from operator import itemgetter
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
+import orjson
 import requests
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-from flask import Flask, jsonify, render_template, request, send_file
+from flask import Flask, Response, g, jsonify, render_template, request
+from flask.json.provider import JSONProvider
 from openai import OpenAI
 from fpdf import FPDF
+from selectolax.lexbor import LexborHTMLParser
 
 load_dotenv()
 
+
+class ORJSONProvider(JSONProvider):
+    """Serve jsonify() and request.get_json() through orjson."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.db")
 
 
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
+def _connect():
+    # timeout is the busy timeout for another writer's lock; 5s is sqlite3's default, spelled out
+    conn = sqlite3.connect(DB_PATH, timeout=5.0)
     conn.row_factory = sqlite3.Row
+    # Per-connection settings (journal_mode=WAL is persisted by init_db)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=134217728")
     return conn
 
 
+def get_db():
+    """Return the current app context's connection, opening it on first use.
+
+    The connection is shared by everything in a request (or background job)
+    and closed by close_db when the context ends.
+    """
+    if "db" not in g:
+        g.db = _connect()
+    return g.db
+
+
+@app.teardown_appcontext
+def close_db(exc):
+    conn = g.pop("db", None)
+    if conn is not None:
+        conn.close()
+
+
 def init_db():
-    conn = get_db()
+    conn = _connect()
+    # WAL lets readers proceed during writes; the mode sticks to the file
+    conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("""
         CREATE TABLE IF NOT EXISTS history (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -87,6 +135,7 @@ def init_db():
         "ALTER TABLE projects ADD COLUMN risk_synthesis_updated_at TEXT DEFAULT ''",
         "ALTER TABLE projects ADD COLUMN entities_cache TEXT DEFAULT ''",
         "ALTER TABLE projects ADD COLUMN entities_updated_at TEXT DEFAULT ''",
+        "ALTER TABLE projects ADD COLUMN entities_summaries_hash TEXT DEFAULT ''",
         "ALTER TABLE history ADD COLUMN risk_categories TEXT DEFAULT ''",
         "ALTER TABLE history ADD COLUMN risk_note TEXT DEFAULT ''",
         "ALTER TABLE history ADD COLUMN article_title_en TEXT DEFAULT ''",
@@ -98,6 +147,98 @@ def init_db():
             conn.execute(sql)
         except sqlite3.OperationalError:
             pass  # Column already exists
+    # Indexes for the sidebar ordering, duplicate-URL check and search.
+    # url is not UNIQUE — the same article can be translated more than once.
+    indexes = [
+        "CREATE INDEX IF NOT EXISTS idx_history_folder_pos ON history(folder_id, position)",
+        "CREATE INDEX IF NOT EXISTS idx_history_url ON history(url)",
+        "CREATE INDEX IF NOT EXISTS idx_history_created ON history(created_at DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_folders_position ON folders(position)",
+        # Source article counts / unlinking; most rows have no source
+        "CREATE INDEX IF NOT EXISTS idx_history_source ON history(source_id) WHERE source_id IS NOT NULL",
+        # Project article lists (newest or oldest first), counts and /unfiled
+        "CREATE INDEX IF NOT EXISTS idx_history_project_created ON history(project_id, created_at DESC)",
+    ]
+    for sql in indexes:
+        conn.execute(sql)
+    # Full-text index over history for /search. External-content FTS5 table
+    # kept in sync by triggers; the trigram tokenizer does substring matching
+    # on Chinese text without word segmentation.
+    fts_exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'history_fts'"
+    ).fetchone()
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+            title, summary, chinese_text, english_text,
+            content='history', content_rowid='id', tokenize='trigram'
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS history_fts_ai AFTER INSERT ON history BEGIN
+            INSERT INTO history_fts(rowid, title, summary, chinese_text, english_text)
+            VALUES (new.id, new.title, new.summary, new.chinese_text, new.english_text);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS history_fts_ad AFTER DELETE ON history BEGIN
+            INSERT INTO history_fts(history_fts, rowid, title, summary, chinese_text, english_text)
+            VALUES ('delete', old.id, old.title, old.summary, old.chinese_text, old.english_text);
+        END
+    """)
+    # Only reindex when an indexed value actually changes: metadata updates
+    # list title in their SET clause even when it is left as it was.
+    # Recreated on startup so existing databases pick up the WHEN clause.
+    conn.execute("DROP TRIGGER IF EXISTS history_fts_au")
+    conn.execute("""
+        CREATE TRIGGER history_fts_au
+        AFTER UPDATE OF title, summary, chinese_text, english_text ON history
+        WHEN old.title IS NOT new.title OR old.summary IS NOT new.summary
+            OR old.chinese_text IS NOT new.chinese_text OR old.english_text IS NOT new.english_text
+        BEGIN
+            INSERT INTO history_fts(history_fts, rowid, title, summary, chinese_text, english_text)
+            VALUES ('delete', old.id, old.title, old.summary, old.chinese_text, old.english_text);
+            INSERT INTO history_fts(rowid, title, summary, chinese_text, english_text)
+            VALUES (new.id, new.title, new.summary, new.chinese_text, new.english_text);
+        END
+    """)
+    if not fts_exists:
+        conn.execute("INSERT INTO history_fts(history_fts) VALUES ('rebuild')")
+    # Change counters behind the ETags on /sources and /projects. Triggers
+    # bump a list's version on any write to its table, and on history
+    # changes that move its article counts.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute("INSERT OR IGNORE INTO data_versions (name) VALUES ('sources'), ('projects')")
+    version_triggers = [
+        ("sources_version_ai", "AFTER INSERT ON sources", "name = 'sources'"),
+        ("sources_version_au", "AFTER UPDATE ON sources", "name = 'sources'"),
+        ("sources_version_ad", "AFTER DELETE ON sources", "name = 'sources'"),
+        ("projects_version_ai", "AFTER INSERT ON projects", "name = 'projects'"),
+        ("projects_version_au", "AFTER UPDATE ON projects", "name = 'projects'"),
+        ("projects_version_ad", "AFTER DELETE ON projects", "name = 'projects'"),
+        ("history_version_ai", "AFTER INSERT ON history",
+         "(name = 'sources' AND new.source_id IS NOT NULL) OR (name = 'projects' AND new.project_id IS NOT NULL)"),
+        ("history_version_ad", "AFTER DELETE ON history",
+         "(name = 'sources' AND old.source_id IS NOT NULL) OR (name = 'projects' AND old.project_id IS NOT NULL)"),
+        ("history_version_au", "AFTER UPDATE OF source_id, project_id ON history",
+         "(name = 'sources' AND old.source_id IS NOT new.source_id) "
+         "OR (name = 'projects' AND old.project_id IS NOT new.project_id)"),
+    ]
+    for name, event, which in version_triggers:
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN "
+            f"UPDATE data_versions SET version = version + 1 WHERE {which}; END"
+        )
+    conn.commit()
+    # Refresh planner statistics (sqlite_stat1) so the partial and composite
+    # indexes are costed from real data; analysis_limit samples each index
+    # instead of reading it whole, keeping startup fast on large histories.
+    conn.execute("PRAGMA analysis_limit=400")
+    conn.execute("ANALYZE")
     conn.commit()
     conn.close()
 
@@ -131,6 +272,21 @@ client = OpenAI(
     base_url="https://api.deepseek.com",
 )
 
+# One pooled HTTP session for all scraping, so repeat fetches from the same
+# site (e.g. the infzm API call and its page fallback) reuse the TLS connection.
+http_session = requests.Session()
+http_session.headers["User-Agent"] = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+_http_adapter = requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=50)
+http_session.mount("https://", _http_adapter)
+http_session.mount("http://", _http_adapter)
+# Keep no cookies between fetches: paywall and anti-bot cookies from one
+# scrape must not leak into unrelated ones running on other threads.
+http_session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
 
 def _extract_infzm_content_id(url):
     """Extract infzm.com content ID from various URL formats."""
@@ -148,16 +304,9 @@ def _extract_infzm_content_id(url):
 def _fetch_infzm_article(content_id):
     """Fetch article from infzm.com's mobile API. Returns dict or None."""
     try:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            )
-        }
-        resp = requests.get(
+        resp = http_session.get(
             f"https://api.infzm.com/mobile/contents/{content_id}",
-            headers=headers, timeout=15,
+            timeout=15,
         )
         if resp.status_code != 200:
             return None
@@ -170,11 +319,9 @@ def _fetch_infzm_article(content_id):
         introtext = c.get("introtext", "")
 
         # Parse HTML content
-        from bs4 import BeautifulSoup
         text = ""
         if fulltext_html:
-            soup = BeautifulSoup(fulltext_html, "html.parser")
-            text = soup.get_text(separator="\n", strip=True)
+            text = _fragment_text(fulltext_html)
 
         # Check if paywalled (truncated)
         word_count = c.get("word_count", 0)
@@ -196,6 +343,42 @@ def _fetch_infzm_article(content_id):
         return None
 
 
+# Class tokens / ids that mark page chrome rather than article content
+_BOILERPLATE_TOKENS = frozenset({
+    "nav", "navbar", "menu", "sidebar", "footer", "header", "banner",
+    "breadcrumb", "comments", "share", "social", "related", "recommend",
+    "ad", "ads", "advertisement", "app-download", "copyright",
+    "disclaimer", "legal", "privacy", "feedback", "login", "signup",
+})
+
+# Everything stripped before looking for the article container, as one
+# selector list so lexbor removes it all in a single pass over the tree.
+# script/style go too — unlike BS4, lexbor includes their text.
+_BOILERPLATE_SELECTOR = ", ".join([
+    "script", "style", "template", "nav", "header", "footer", "aside",
+    "noscript", "iframe", "svg", "form", "button",
+    *(f'[role="{role}"]' for role in
+      ("navigation", "banner", "complementary", "contentinfo")),
+    *(f'[class~="{token}" i]' for token in sorted(_BOILERPLATE_TOKENS)),
+    *(f'[id="{token}" i]' for token in sorted(_BOILERPLATE_TOKENS)),
+])
+
+# Hashed CSS-module class names like "cententWrap__xxx"
+_CONTENT_CLASS_RE = re.compile(
+    r"(?:content|article|news.?(?:txt|body|detail)|"
+    r"centet|text.?wrap|post.?body).*__",
+    re.IGNORECASE,
+)
+
+_CJK_RE = re.compile(r"[\u4e00-\u9fff]")
+_NON_CJK_RE = re.compile(r"[^\u4e00-\u9fff]+")
+
+
+def _count_cjk(text):
+    """Count CJK unified ideographs in text."""
+    return len(_NON_CJK_RE.sub("", text))
+
+
 def fetch_article_from_url(url):
     """Fetch and extract text content + metadata from a Chinese article URL.
 
@@ -207,108 +390,52 @@ def fetch_article_from_url(url):
         result = _fetch_infzm_article(infzm_id)
         if result and result.get("text"):
             return result
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        )
-    }
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = http_session.get(url, timeout=15)
     resp.encoding = resp.apparent_encoding
-    soup = BeautifulSoup(resp.text, "html.parser")
+    tree = LexborHTMLParser(resp.text)
 
     # --- Strategy 1: Extract from embedded JSON (Next.js, nuxt, etc.) ---
-    result = _try_extract_json_content(soup)
+    result = _try_extract_json_content(resp.text)
     if result:
         # result is now a dict with text + metadata
         return result
 
     # --- Strategy 2: HTML-based extraction ---
     # Extract metadata from HTML before stripping tags
-    meta = _extract_html_metadata(soup)
-
-    # Remove non-content elements
-    for tag in soup(["nav", "header", "footer", "aside",
-                      "noscript", "iframe", "svg", "form", "button"]):
-        tag.decompose()
-
-    # Remove boilerplate by role (collect first to avoid mutation during iteration)
-    to_remove = [
-        el for el in soup.find_all(attrs={"role": True})
-        if el.attrs and el.attrs.get("role") in (
-            "navigation", "banner", "complementary", "contentinfo")
-    ]
-    for el in to_remove:
-        el.decompose()
-
-    # Remove elements whose class token exactly matches boilerplate names
-    boilerplate_tokens = {
-        "nav", "navbar", "menu", "sidebar", "footer", "header", "banner",
-        "breadcrumb", "comments", "share", "social", "related", "recommend",
-        "ad", "ads", "advertisement", "app-download", "copyright",
-        "disclaimer", "legal", "privacy", "feedback", "login", "signup",
-    }
-    to_remove = [
-        el for el in soup.find_all(attrs={"class": True})
-        if {c.lower() for c in (el.get("class") or [])} & boilerplate_tokens
-    ]
-    for el in to_remove:
-        el.decompose()
-    to_remove = [
-        el for el in soup.find_all(attrs={"id": True})
-        if (el.get("id") or "").lower() in boilerplate_tokens
-    ]
-    for el in to_remove:
-        el.decompose()
+    meta = _extract_html_metadata(tree)
+
+    # Remove non-content elements, boilerplate roles, and elements whose
+    # class token or id exactly matches boilerplate names
+    _decompose_all(tree.css(_BOILERPLATE_SELECTOR))
 
     # Find article container
-    container = soup.find("article")
+    container = tree.css_first("article")
 
     if not container:
         selectors = [
-            {"class_": "article-content"}, {"class_": "article_content"},
-            {"class_": "news_txt"}, {"class_": "news-content"},
-            {"class_": "post_body"}, {"class_": "post_text"},
-            {"id": "artibody"}, {"id": "article"},
+            ".article-content", ".article_content",
+            ".news_txt", ".news-content",
+            ".post_body", ".post_text",
+            "#artibody", "#article",
         ]
         for sel in selectors:
-            container = soup.find(**sel)
+            container = tree.css_first(sel)
             if container:
                 break
 
     # Match hashed class names like "cententWrap__xxx"
     if not container:
-        content_class_re = re.compile(
-            r"(?:content|article|news.?(?:txt|body|detail)|"
-            r"centet|text.?wrap|post.?body).*__",
-            re.IGNORECASE,
-        )
-        for div in soup.find_all("div", class_=True):
-            classes = " ".join(div.get("class", []))
-            if content_class_re.search(classes):
+        for div in tree.css("div[class]"):
+            classes = div.attributes.get("class") or ""
+            if _CONTENT_CLASS_RE.search(classes):
                 container = div
                 break
 
     # Fallback: narrowest div with substantial Chinese text
     if not container:
-        candidates = []
-        for div in soup.find_all("div"):
-            txt = div.get_text(strip=True)
-            cn_chars = sum(1 for c in txt if '\u4e00' <= c <= '\u9fff')
-            if cn_chars > 100:
-                candidates.append((div, cn_chars, len(txt)))
-        if candidates:
-            max_cn = max(c[1] for c in candidates)
-            threshold = max_cn * 0.6
-            candidates = [c for c in candidates if c[1] >= threshold]
-            candidates.sort(key=lambda c: c[2])
-            container = candidates[0][0]
-
-    if container:
-        raw = container.get_text(separator="\n", strip=True)
-    else:
-        raw = soup.get_text(separator="\n", strip=True)
+        container = _narrowest_cjk_div(tree)
+
+    raw = _node_text(container or tree.root)
 
     return {
         "text": _clean_article_text(raw),
@@ -319,93 +446,185 @@ def fetch_article_from_url(url):
     }
 
 
-def _extract_html_metadata(soup):
+def _child_divs(node):
+    """Yield the nearest <div> descendants of node, in document order."""
+    for child in node.iter():
+        if child.tag == "div":
+            yield child
+        else:
+            yield from _child_divs(child)
+
+
+def _narrowest_cjk_div(tree):
+    """Find the shortest div holding >100 and >=60% of the page's max CJK chars.
+
+    A div's text includes all of its descendants' text, so both counts only
+    grow towards the root. That lets us search top-down: the outermost divs
+    give the max, and a div that falls below the threshold rules out its
+    whole subtree, so only the qualifying chain(s) of divs are ever measured.
+    """
+    def measure(divs):
+        for div in divs:
+            txt = div.text(strip=True)
+            yield div, _count_cjk(txt), len(txt)
+
+    top = list(measure(_child_divs(tree.root)))
+    max_cn = max((cn for _, cn, _ in top), default=0)
+    if max_cn <= 100:
+        return None
+    threshold = max_cn * 0.6
+
+    best, best_len = None, None
+    stack = [c for c in reversed(top) if c[1] > 100 and c[1] >= threshold]
+    while stack:
+        div, _, length = stack.pop()
+        if best_len is None or length < best_len:
+            best, best_len = div, length
+        stack.extend(c for c in reversed(list(measure(_child_divs(div))))
+                     if c[1] > 100 and c[1] >= threshold)
+    return best
+
+
+def _node_text(node):
+    """Return the text under a lexbor node, one non-empty string per line."""
+    text = node.text(separator="\n", strip=True)
+    return "\n".join(line for line in text.split("\n") if line)
+
+
+def _fragment_text(html):
+    """Parse an HTML fragment (e.g. article body from a JSON API) to text."""
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(["script", "style"])
+    return _node_text(tree.body) if tree.body else ""
+
+
+def _decompose_all(nodes):
+    """Remove nodes from their tree, innermost first.
+
+    Nodes are in document order, so going in reverse never touches a node
+    whose ancestor has already been freed. A selector list returns a node
+    once per selector it matches, so duplicates are dropped first.
+    """
+    unique = {node.mem_id: node for node in nodes}
+    for node in reversed(list(unique.values())):
+        node.decompose()
+
+
+def _meta_tags(tree):
+    """Index <meta> content= by property and by name in one pass over the page.
+
+    Like css_first(), the first tag with a given property/name wins.
+    """
+    by_property = {}
+    by_name = {}
+    for tag in tree.css("meta"):
+        attrs = tag.attributes
+        content = (attrs.get("content") or "").strip()
+        if attrs.get("property") is not None:
+            by_property.setdefault(attrs["property"], content)
+        if attrs.get("name") is not None:
+            by_name.setdefault(attrs["name"], content)
+    return by_property, by_name
+
+
+def _extract_html_metadata(tree):
     """Extract title, publication name, and date from HTML meta tags."""
     meta = {}
+    by_property, by_name = _meta_tags(tree)
 
     # Title: og:title > <title> tag
-    og_title = soup.find("meta", property="og:title")
-    if og_title and og_title.get("content", "").strip():
-        meta["title"] = og_title["content"].strip()
+    og_title = by_property.get("og:title")
+    if og_title:
+        meta["title"] = og_title
     else:
-        title_tag = soup.find("title")
+        title_tag = tree.css_first("title")
         if title_tag:
-            raw = title_tag.get_text(strip=True)
+            raw = title_tag.text(strip=True)
             # Strip common suffixes like " - 新浪网" or "_腾讯新闻"
             raw = re.split(r'\s*[_\-|–—]\s*(?!.*[_\-|–—])', raw, maxsplit=1)[0].strip()
             if raw:
                 meta["title"] = raw
 
     # Source/publication: og:site_name > meta[name=source/publisher]
-    og_site = soup.find("meta", property="og:site_name")
-    if og_site and og_site.get("content", "").strip():
-        meta["source_name"] = og_site["content"].strip()
+    og_site = by_property.get("og:site_name")
+    if og_site:
+        meta["source_name"] = og_site
     else:
         for attr in ("source", "publisher"):
-            tag = soup.find("meta", attrs={"name": attr})
-            if tag and tag.get("content", "").strip():
-                meta["source_name"] = tag["content"].strip()
+            content = by_name.get(attr)
+            if content:
+                meta["source_name"] = content
                 break
 
     # Author: meta[name=author] > article:author
     for attr in ("author",):
-        tag = soup.find("meta", attrs={"name": attr})
-        if tag and tag.get("content", "").strip():
-            meta["author"] = tag["content"].strip()
+        content = by_name.get(attr)
+        if content:
+            meta["author"] = content
             break
     if "author" not in meta:
-        tag = soup.find("meta", property="article:author")
-        if tag and tag.get("content", "").strip():
-            meta["author"] = tag["content"].strip()
+        content = by_property.get("article:author")
+        if content:
+            meta["author"] = content
 
     # Date: article:published_time > meta[name=publishdate]
     for prop in ("article:published_time", "og:article:published_time"):
-        tag = soup.find("meta", property=prop)
-        if tag and tag.get("content", "").strip():
-            meta["pub_date"] = tag["content"].strip()[:10]
+        content = by_property.get(prop)
+        if content:
+            meta["pub_date"] = content[:10]
             break
     if "pub_date" not in meta:
         for name in ("publishdate", "publish_date", "date", "PubDate"):
-            tag = soup.find("meta", attrs={"name": name})
-            if tag and tag.get("content", "").strip():
-                meta["pub_date"] = tag["content"].strip()[:10]
+            content = by_name.get(name)
+            if content:
+                meta["pub_date"] = content[:10]
                 break
 
     return meta
 
 
-def _try_extract_json_content(soup):
+# Script bodies are raw text in HTML, so these are matched against the page
+# source directly instead of walking the parsed tree.
+_NEXT_DATA_RE = re.compile(
+    r"""<script\b[^>]*\bid=["']?__NEXT_DATA__["']?[^>]*>(.*?)</script>""",
+    re.IGNORECASE | re.DOTALL,
+)
+_SCRIPT_RE = re.compile(r"<script\b[^>]*>(.*?)</script>", re.IGNORECASE | re.DOTALL)
+_JSON_BLOB_MARKERS_RE = re.compile(r"contentDetail|articleBody")
+
+
+def _try_extract_json_content(html):
     """Extract article from embedded JSON data (__NEXT_DATA__, etc.).
 
     Returns a dict {text, title, source_name, pub_date} or None.
     """
     # Next.js sites (thepaper.cn, etc.)
-    script = soup.find("script", id="__NEXT_DATA__")
-    if script and script.string:
+    m = _NEXT_DATA_RE.search(html)
+    if m and m.group(1):
         try:
-            data = json.loads(script.string)
+            data = orjson.loads(m.group(1))
             return _extract_from_nextdata(data)
         except (json.JSONDecodeError, KeyError):
             pass
 
     # Generic: look for large JSON blobs in script tags
-    for script in soup.find_all("script"):
-        txt = script.string or ""
+    if not _JSON_BLOB_MARKERS_RE.search(html):
+        return None
+    for m in _SCRIPT_RE.finditer(html):
+        txt = m.group(1)
         if "contentDetail" in txt or "articleBody" in txt:
             # Try to find JSON object
             match = re.search(r'\{.*"content(?:Detail|_detail)".*\}', txt,
                               re.DOTALL)
             if match:
                 try:
-                    data = json.loads(match.group())
+                    data = orjson.loads(match.group())
                     body = (data.get("contentDetail", {}).get("content")
                             or data.get("content_detail", {}).get("content")
                             or "")
                     if body:
-                        inner = BeautifulSoup(body, "html.parser")
                         return {
-                            "text": _clean_article_text(
-                                inner.get_text(separator="\n", strip=True)),
+                            "text": _clean_article_text(_fragment_text(body)),
                             "title": "",
                             "source_name": "",
                             "author": "",
@@ -431,8 +650,7 @@ def _extract_from_nextdata(data):
         source = (detail.get("source") or "").strip()
         pub_time = (detail.get("pubTimeLong") or detail.get("pubTime") or "")
         content_html = detail.get("content", "")
-        inner = BeautifulSoup(content_html, "html.parser")
-        body = inner.get_text(separator="\n", strip=True)
+        body = _fragment_text(content_html)
 
         # Build text with metadata header
         parts = []
@@ -467,9 +685,8 @@ def _extract_from_nextdata(data):
             content = (obj.get("content") or obj.get("body")
                        or obj.get("text") or "")
             if content and len(content) > 50:
-                inner = BeautifulSoup(content, "html.parser")
                 title = obj.get("title", "")
-                body = inner.get_text(separator="\n", strip=True)
+                body = _fragment_text(content)
                 return {
                     "text": (title + "\n" + body) if title else body,
                     "title": title,
@@ -480,101 +697,201 @@ def _extract_from_nextdata(data):
     return None
 
 
+_FOOTER_MARKERS = (
+    "特别声明", "免责声明", "版权声明", "责任编辑",
+    "原标题：", "阅读原文", "返回搜狐", "举报/反馈",
+    "扫码下载", "下载客户端", "关于我们", "联系我们",
+    "©", "ICP备", "ICP证", "京公网安备", "沪公网安备",
+)
+_FOOTER_RE = re.compile("|".join(map(re.escape, _FOOTER_MARKERS)))
+
+
 def _clean_article_text(raw):
     """Remove footer boilerplate and UI junk from extracted text."""
-    footer_markers = [
-        "特别声明", "免责声明", "版权声明", "责任编辑",
-        "原标题：", "阅读原文", "返回搜狐", "举报/反馈",
-        "扫码下载", "下载客户端", "关于我们", "联系我们",
-        "©", "ICP备", "ICP证", "京公网安备", "沪公网安备",
-    ]
+    # Stop at footer boilerplate: drop everything from the line holding the first marker
+    footer = _FOOTER_RE.search(raw)
+    if footer:
+        head = raw[:footer.start()].splitlines(keepends=True)
+        # Drop the text before the marker on its own line; splitlines() keeps
+        # a trailing line break only when that line ended before the marker
+        if head and head[-1].splitlines()[0] == head[-1]:
+            head.pop()
+        raw = "".join(head)
+    lines = [line.strip() for line in raw.splitlines()]
+    # Skip very short non-Chinese lines (UI remnants like "+1")
+    return "\n".join(line for line in lines if len(line) > 4 or _CJK_RE.search(line))
+
+
+# System prompts are fixed strings sent as the first message, with the
+# per-request content only in the user turn. That keeps the request prefix
+# byte-identical across calls so DeepSeek's context cache can reuse it.
+TRANSLATION_SYSTEM_PROMPT = (
+    "You are a professional Chinese-to-English translator "
+    "specializing in news articles, legal documents, and "
+    "adverse media reports. Translate the following Chinese "
+    "text into clear, accurate English. Preserve paragraph "
+    "structure. Do not add commentary — only output the "
+    "translation.\n\n"
+    "Translation guidelines:\n"
+    "- Translate every sentence; do not summarize, merge, or omit content.\n"
+    "- Write Chinese personal names in Hanyu Pinyin, surname first "
+    "(e.g. 张三 → Zhang San).\n"
+    "- Use the established English names of government bodies, courts and "
+    "regulators where one exists (e.g. 中国证监会 → China Securities "
+    "Regulatory Commission).\n"
+    "- Convert amounts written with 万 and 亿 exactly (1万 = 10,000; "
+    "1亿 = 100 million) and keep the original currency.\n"
+    "- Render legal terms precisely (e.g. 立案调查 → opened a formal "
+    "investigation, 行政处罚 → administrative penalty) and keep the "
+    "distinction between allegations, charges and convictions.\n"
+    "- Keep dates, figures and quoted statements exactly as in the source."
+)
 
-    lines = []
-    for line in raw.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        # Stop at footer boilerplate
-        if any(marker in line for marker in footer_markers):
-            break
-        # Skip very short non-Chinese lines (UI remnants like "+1")
-        if len(line) <= 4 and not any('\u4e00' <= c <= '\u9fff' for c in line):
-            continue
-        lines.append(line)
+SUMMARY_SYSTEM_PROMPT = (
+    "You are an analyst producing concise executive summaries of "
+    "adverse media articles for compliance and due-diligence teams. "
+    "Given a Chinese article, produce a structured summary in English "
+    "in this exact format:\n\n"
+    "OVERVIEW: 2-3 sentence summary of the article.\n\n"
+    "KEY ENTITIES: Bullet list of people, companies, or organizations mentioned. "
+    "Write each name in both Chinese and English, e.g. '张三 (Zhang San)' or '新华社 (Xinhua News Agency)'.\n\n"
+    "KEY CLAIMS: Bullet list of the main allegations, findings, or events.\n\n"
+    "KEY DATES: Bullet list of any significant dates mentioned.\n\n"
+    "Use plain text with bullet points (- ). Be concise and factual. "
+    "Do not add commentary beyond what is in the article."
+)
 
-    return "\n".join(lines)
+CATEGORIZE_SYSTEM_PROMPT = (
+    "You are a compliance analyst conducting an adverse media review on a subject. "
+    "You will be given the subject, an article title and an article summary.\n\n"
+    "From the list below, identify which risk categories the article raises in relation to the subject. "
+    "Only flag a category if the article contains clear evidence or allegations relevant to the subject.\n\n"
+    "Categories:\n"
+    + "\n".join(f"- {c['key']}: {c['label']}" for c in RISK_CATEGORIES)
+    + "\n\nRespond in this exact JSON format (no markdown, no extra text):\n"
+    '{"categories": ["key1", "key2"], "note": "One sentence explaining how this article relates to the subject."}\n\n'
+    'If no categories apply, return: {"categories": [], "note": "No adverse findings relevant to the subject."}'
+)
 
 
-def translate_chinese_to_english(text):
-    """Translate Chinese text to English using DeepSeek API."""
-    response = client.chat.completions.create(
+def _log_cache_usage(label, response):
+    """Log DeepSeek's prompt-cache hit/miss token counts for a completion."""
+    usage = getattr(response, "usage", None)
+    hit = getattr(usage, "prompt_cache_hit_tokens", None)
+    if hit is None:
+        return
+    miss = getattr(usage, "prompt_cache_miss_tokens", 0)
+    app.logger.debug("%s: prompt cache %s hit / %s miss tokens", label, hit, miss)
+
+
+# Articles longer than this are split into paragraph-aligned chunks that are
+# translated as concurrent requests; the provider batches them, so latency
+# tracks the longest chunk rather than the whole article.
+CHUNKED_TRANSLATION_THRESHOLD = 4000
+TRANSLATION_CHUNK_CHARS = 2000
+TRANSLATION_WORKERS = 4
+
+
+def _chunk_text(text, max_chars=TRANSLATION_CHUNK_CHARS):
+    """Split text into chunks of at most max_chars without breaking a line.
+
+    A single line longer than max_chars becomes a chunk of its own.
+    """
+    chunks = []
+    current = []
+    size = 0
+    for line in text.split("\n"):
+        if current and size + len(line) > max_chars:
+            chunks.append("\n".join(current).strip("\n"))
+            current = []
+            size = 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append("\n".join(current).strip("\n"))
+    return [c for c in chunks if c]
+
+
+def _stream_translation(text):
+    """Yield the translation of text from a single streamed DeepSeek request."""
+    stream = client.chat.completions.create(
         model="deepseek-chat",
         messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are a professional Chinese-to-English translator "
-                    "specializing in news articles, legal documents, and "
-                    "adverse media reports. Translate the following Chinese "
-                    "text into clear, accurate English. Preserve paragraph "
-                    "structure. Do not add commentary — only output the "
-                    "translation."
-                ),
-            },
+            {"role": "system", "content": TRANSLATION_SYSTEM_PROMPT},
             {"role": "user", "content": text},
         ],
         temperature=0.3,
+        stream=True,
+        stream_options={"include_usage": True},
     )
-    return response.choices[0].message.content
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+        if chunk.usage:
+            _log_cache_usage("translate", chunk)
+
+
+def _translate_chunk(text):
+    return "".join(_stream_translation(text))
+
+
+def stream_chinese_to_english(text):
+    """Translate Chinese text to English using DeepSeek API, yielding text as it decodes.
+
+    Long texts are translated chunk by chunk in parallel and yielded in
+    order as each chunk completes.
+    """
+    if len(text) <= CHUNKED_TRANSLATION_THRESHOLD:
+        yield from _stream_translation(text)
+        return
+    chunks = _chunk_text(text)
+    with ThreadPoolExecutor(max_workers=TRANSLATION_WORKERS) as pool:
+        futures = [pool.submit(_translate_chunk, chunk) for chunk in chunks]
+        for i, future in enumerate(futures):
+            if i:
+                yield "\n\n"
+            yield future.result()
+
+
+def translate_chinese_to_english(text):
+    """Translate Chinese text to English using DeepSeek API."""
+    return "".join(stream_chinese_to_english(text))
 
 
-def generate_summary(english_text):
-    """Generate an executive summary of the translated article using DeepSeek."""
+def generate_summary(chinese_text):
+    """Generate an English executive summary of a Chinese article using DeepSeek.
+
+    Works from the Chinese source rather than the translation so it can run
+    alongside translate_chinese_to_english instead of after it.
+    """
     response = client.chat.completions.create(
         model="deepseek-chat",
         messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are an analyst producing concise executive summaries of "
-                    "adverse media articles for compliance and due-diligence teams. "
-                    "Given the English translation of a Chinese article, produce a "
-                    "structured summary in this exact format:\n\n"
-                    "OVERVIEW: 2-3 sentence summary of the article.\n\n"
-                    "KEY ENTITIES: Bullet list of people, companies, or organizations mentioned. "
-                    "Write each name in both Chinese and English, e.g. '张三 (Zhang San)' or '新华社 (Xinhua News Agency)'.\n\n"
-                    "KEY CLAIMS: Bullet list of the main allegations, findings, or events.\n\n"
-                    "KEY DATES: Bullet list of any significant dates mentioned.\n\n"
-                    "Use plain text with bullet points (- ). Be concise and factual. "
-                    "Do not add commentary beyond what is in the article."
-                ),
-            },
-            {"role": "user", "content": english_text},
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": chinese_text},
         ],
         temperature=0.3,
     )
+    _log_cache_usage("summary", response)
     return response.choices[0].message.content
 
 
 def categorize_article(subject_name, article_title, summary):
     """Categorize a single article against the risk categories for a given subject."""
-    category_list = "\n".join(f"- {c['key']}: {c['label']}" for c in RISK_CATEGORIES)
     prompt = (
-        f"You are a compliance analyst conducting an adverse media review on the subject: \"{subject_name}\".\n\n"
+        f"Subject: \"{subject_name}\"\n\n"
         f"Article title: {article_title}\n\n"
-        f"Article summary:\n{summary}\n\n"
-        f"From the list below, identify which risk categories this article raises in relation to the subject. "
-        f"Only flag a category if the article contains clear evidence or allegations relevant to the subject.\n\n"
-        f"Categories:\n{category_list}\n\n"
-        f"Respond in this exact JSON format (no markdown, no extra text):\n"
-        f'{{"categories": ["key1", "key2"], "note": "One sentence explaining how this article relates to {subject_name}."}}\n\n'
-        f"If no categories apply, return: {{\"categories\": [], \"note\": \"No adverse findings relevant to {subject_name}.\"}}"
+        f"Article summary:\n{summary}"
     )
     response = client.chat.completions.create(
         model="deepseek-chat",
-        messages=[{"role": "user", "content": prompt}],
+        messages=[
+            {"role": "system", "content": CATEGORIZE_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
         temperature=0.1,
     )
+    _log_cache_usage("categorize", response)
     raw = response.choices[0].message.content.strip()
     try:
         return json.loads(raw)
@@ -616,25 +933,43 @@ def search_history():
     q = (request.args.get("q") or "").strip()
     if not q:
         return jsonify([])
+    # The subqueries return only the listed columns, with an 80-character
+    # preview instead of the full article text
+    if len(q) >= 3:
+        # Trigram index: the whole query as one phrase is a substring match
+        phrase = '"' + q.replace('"', '""') + '"'
+        matches = (
+            "SELECT h.id, h.url, h.title, substr(h.chinese_text, 1, 80) AS preview, h.folder_id, h.project_id, h.pub_date, h.created_at "
+            "FROM history_fts JOIN history h ON h.id = history_fts.rowid "
+            "WHERE history_fts MATCH ? ORDER BY h.created_at DESC LIMIT 50"
+        )
+        params = (phrase,)
+    else:
+        # Trigrams need 3+ characters; short queries (e.g. 2-char names) scan
+        like = f"%{q}%"
+        matches = (
+            "SELECT id, url, title, substr(chinese_text, 1, 80) AS preview, folder_id, project_id, pub_date, created_at "
+            "FROM history WHERE title LIKE ? OR summary LIKE ? OR chinese_text LIKE ? OR english_text LIKE ? "
+            "ORDER BY created_at DESC LIMIT 50"
+        )
+        params = (like, like, like, like)
+    return _json_array_response(
+        "SELECT json_group_array(json_object("
+        "'id', id, 'url', url, 'title', COALESCE(title, ''), 'preview', preview, "
+        "'folder_id', folder_id, 'project_id', project_id, 'pub_date', COALESCE(pub_date, ''), "
+        f"'created_at', created_at)) FROM ({matches})",
+        params,
+    )
+
+
+def _json_array_response(sql, params=()):
+    """Return the JSON text built by a json_group_array() query as the response body.
+
+    SQLite assembles the list, so rows are never turned into Python dicts.
+    """
     conn = get_db()
-    like = f"%{q}%"
-    rows = conn.execute(
-        "SELECT id, url, title, chinese_text, summary, folder_id, project_id, pub_date, created_at "
-        "FROM history WHERE title LIKE ? OR summary LIKE ? OR chinese_text LIKE ? OR english_text LIKE ? "
-        "ORDER BY created_at DESC LIMIT 50",
-        (like, like, like, like),
-    ).fetchall()
-    conn.close()
-    return jsonify([{
-        "id": r["id"],
-        "url": r["url"],
-        "title": r["title"] or "",
-        "preview": r["chinese_text"][:80],
-        "folder_id": r["folder_id"],
-        "project_id": r["project_id"],
-        "pub_date": r["pub_date"] or "",
-        "created_at": r["created_at"],
-    } for r in rows])
+    body = conn.execute(sql, params).fetchone()[0]
+    return Response(body, mimetype="application/json")
 
 
 @app.route("/history/check-url")
@@ -646,7 +981,6 @@ def check_duplicate_url():
     row = conn.execute(
         "SELECT id, title, created_at FROM history WHERE url = ? LIMIT 1", (url,)
     ).fetchone()
-    conn.close()
     if row:
         return jsonify({
             "exists": True,
@@ -657,90 +991,304 @@ def check_duplicate_url():
     return jsonify({"exists": False})
 
 
+# Recently scraped articles, keyed by normalized URL
+ARTICLE_CACHE_SIZE = 512
+ARTICLE_CACHE_TTL = 3600  # seconds
+_article_cache = OrderedDict()
+_article_cache_lock = threading.Lock()
+
+
+def _normalize_url(url):
+    """Drop tracking parameters and page anchors so equivalent URLs share a cache key.
+
+    Hash routes such as infzm's /wap/#/content/123 identify the article
+    and are kept.
+    """
+    parts = urlsplit(url.strip())
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() != "spm"
+    ])
+    fragment = parts.fragment if parts.fragment.startswith(("/", "!")) else ""
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, fragment))
+
+
+def _fetch_article_cached(url, refresh=False):
+    """fetch_article_from_url with an in-memory TTL/LRU cache of successful scrapes.
+
+    refresh skips the lookup but still stores the fresh result.
+    """
+    key = _normalize_url(url)
+    now = time.monotonic()
+    with _article_cache_lock:
+        hit = None if refresh else _article_cache.get(key)
+        if hit and now - hit[0] < ARTICLE_CACHE_TTL:
+            _article_cache.move_to_end(key)
+            return hit[1]
+    result = fetch_article_from_url(url)
+    if result.get("text"):
+        with _article_cache_lock:
+            _article_cache[key] = (now, result)
+            _article_cache.move_to_end(key)
+            while len(_article_cache) > ARTICLE_CACHE_SIZE:
+                _article_cache.popitem(last=False)
+    return result
+
+
+def _load_source(input_url, input_text, refresh=False):
+    """Return the article to translate as {text, title, source_name, author, pub_date}.
+
+    A URL that is already in history reuses the stored source text and
+    metadata, and recent scrapes are served from the article cache; set
+    refresh to fetch the page again.
+    """
+    if not input_url:
+        return {"text": input_text, "title": "", "source_name": "", "author": "", "pub_date": ""}
+    if not refresh:
+        conn = get_db()
+        row = conn.execute(
+            "SELECT chinese_text, title, scraped_source_name, author, pub_date FROM history "
+            "WHERE url = ? AND chinese_text != '' ORDER BY created_at DESC LIMIT 1",
+            (input_url,),
+        ).fetchone()
+        if row:
+            return {
+                "text": row["chinese_text"],
+                "title": row["title"] or "",
+                "source_name": row["scraped_source_name"] or "",
+                "author": row["author"] or "",
+                "pub_date": row["pub_date"] or "",
+            }
+    result = _fetch_article_cached(input_url, refresh=refresh)
+    return {
+        "text": result.get("text", ""),
+        "title": result.get("title", ""),
+        "source_name": result.get("source_name", ""),
+        "author": result.get("author", ""),
+        "pub_date": result.get("pub_date", ""),
+    }
+
+
+def _save_translation(input_url, source, english_text, summary, project_id):
+    """Save a finished translation to history and return the /translate payload."""
+    # Auto-save to history (prepend to Unfiled)
+    conn = get_db()
+    cur = conn.execute(
+        "INSERT INTO history (url, chinese_text, english_text, summary, title, scraped_source_name, pub_date, author, folder_id, position, project_id, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, (SELECT COALESCE(MIN(position), 1) - 1 FROM history WHERE folder_id IS NULL), ?, ?)",
+        (input_url, source["text"], english_text, summary, source["title"], source["source_name"], source["pub_date"], source["author"], project_id, datetime.now(timezone.utc).isoformat()),
+    )
+    history_id = cur.lastrowid
+    conn.commit()
+
+    # Auto-categorize if article belongs to a project
+    if project_id:
+        project_row = conn.execute("SELECT project_name, client_name_cn FROM projects WHERE id = ?", (project_id,)).fetchone()
+        subject = (project_row["client_name_cn"] or project_row["project_name"]) if project_row else ""
+        if subject and summary:
+            try:
+                result = categorize_article(subject, source["title"], summary)
+                conn.execute(
+                    "UPDATE history SET risk_categories = ?, risk_note = ? WHERE id = ?",
+                    (json.dumps(result.get("categories", [])), result.get("note", ""), history_id),
+                )
+                conn.commit()
+            except Exception:
+                pass
+
+    return {
+        "id": history_id,
+        "chinese": source["text"],
+        "english": english_text,
+        "summary": summary,
+        "project_id": project_id,
+        "title": source["title"],
+        "source_name": source["source_name"],
+        "author": source["author"],
+        "pub_date": source["pub_date"],
+    }
+
+
+def _sse(payload):
+    """Format one Server-Sent Events message carrying a JSON payload."""
+    return f"data: {orjson.dumps(payload).decode()}\n\n"
+
+
+def _translation_events(input_url, input_text, project_id, refresh=False):
+    """Run a translation, yielding progress events as dicts.
+
+    Events are {"type": "source", ...metadata} once the article is known,
+    {"type": "delta", "text"} for each piece of decoded translation, then
+    {"type": "done", ...} with the same payload the JSON response carries,
+    or {"type": "error", "error"} if anything fails part way.
+    """
+    try:
+        try:
+            source = _load_source(input_url, input_text, refresh=refresh)
+        except requests.RequestException as e:
+            yield {"type": "error", "error": f"Failed to fetch URL: {e}"}
+            return
+        if not source["text"]:
+            yield {"type": "error", "error": "No text content found."}
+            return
+        yield {"type": "source", "chinese": source["text"], "title": source["title"],
+               "source_name": source["source_name"], "author": source["author"],
+               "pub_date": source["pub_date"]}
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            summary_future = pool.submit(generate_summary, source["text"])
+            parts = []
+            for delta in stream_chinese_to_english(source["text"]):
+                parts.append(delta)
+                yield {"type": "delta", "text": delta}
+            summary = summary_future.result()
+        result = _save_translation(input_url, source, "".join(parts), summary, project_id)
+        yield {"type": "done", **result}
+    except Exception as e:
+        yield {"type": "error", "error": f"Translation failed: {e}"}
+
+
+# Background translations, keyed by job id. Each job records its progress
+# so a stream can tail it and /translate/status can report it; finished
+# jobs are kept for an hour for late status polls.
+TRANSLATION_JOB_WORKERS = 4
+TRANSLATION_JOB_RETENTION = 3600  # seconds
+TRANSLATION_JOB_IDLE_TIMEOUT = 300  # seconds a stream waits without progress
+_job_pool = ThreadPoolExecutor(max_workers=TRANSLATION_JOB_WORKERS)
+_jobs = {}
+_jobs_cond = threading.Condition()
+
+
+def _prune_translation_jobs():
+    """Drop jobs that finished more than the retention period ago. Hold _jobs_cond."""
+    now = time.monotonic()
+    for old_id in [j for j, job in _jobs.items()
+                   if job["finished_at"] and now - job["finished_at"] > TRANSLATION_JOB_RETENTION]:
+        del _jobs[old_id]
+
+
+def _start_translation_job(input_url, input_text, project_id, refresh=False):
+    """Queue a translation on the background pool and return its job id."""
+    job_id = uuid.uuid4().hex
+    with _jobs_cond:
+        _prune_translation_jobs()
+        # english: decoded pieces while running, joined into one string on error;
+        # once done the result carries the English instead
+        _jobs[job_id] = {"status": "running", "source": None, "english": [], "result": None,
+                         "error": None, "finished_at": None}
+    _job_pool.submit(_run_translation_job, job_id, input_url, input_text, project_id, refresh)
+    return job_id
+
+
+def _run_translation_job(job_id, input_url, input_text, project_id, refresh):
+    with app.app_context():
+        for event in _translation_events(input_url, input_text, project_id, refresh):
+            with _jobs_cond:
+                job = _jobs[job_id]
+                kind = event.pop("type")
+                if kind == "delta":
+                    job["english"].append(event["text"])
+                elif kind == "source":
+                    job["source"] = event
+                else:
+                    job["status"] = kind
+                    job["finished_at"] = time.monotonic()
+                    if kind == "done":
+                        job["result"] = event
+                        job["english"] = ""
+                    else:
+                        job["error"] = event["error"]
+                        job["english"] = "".join(job["english"])
+                _jobs_cond.notify_all()
+
+
+def _tail_translation_job(job_id):
+    """Yield a job's events as SSE messages, waiting for new ones until it finishes."""
+    source_sent = False
+    sent_pieces = 0
+    sent_chars = 0
+
+    def has_news():
+        job = _jobs.get(job_id)
+        return (not job or job["status"] != "running" or (job["source"] and not source_sent)
+                or len(job["english"]) > sent_pieces)
+
+    while True:
+        with _jobs_cond:
+            job = _jobs.get(job_id)
+            if not job or not _jobs_cond.wait_for(has_news, TRANSLATION_JOB_IDLE_TIMEOUT) or job_id not in _jobs:
+                job = None
+            else:
+                source = None if source_sent else job["source"]
+                status = job["status"]
+                if status == "running":
+                    pieces = job["english"][sent_pieces:]
+                    sent_pieces += len(pieces)
+                    english = "".join(pieces)
+                else:
+                    english = (job["result"]["english"] if status == "done" else job["english"])[sent_chars:]
+                result, error = job["result"], job["error"]
+        if not job:
+            yield _sse({"type": "error", "error": "Translation timed out."})
+            return
+        if source:
+            source_sent = True
+            yield _sse({"type": "source", **source})
+        if english:
+            sent_chars += len(english)
+            yield _sse({"type": "delta", "text": english})
+        if status == "done":
+            yield _sse({"type": "done", **result})
+            return
+        if status == "error":
+            yield _sse({"type": "error", "error": error})
+            return
+
+
 @app.route("/translate", methods=["POST"])
 def translate():
+    """Translate a URL or pasted text and save it to history.
+
+    Returns the finished result as JSON by default. With "stream": true the
+    work runs as a background job whose events (see _translation_events)
+    are streamed as Server-Sent Events; with "background": true the job id
+    is returned straight away for polling /translate/status/<job_id>.
+    Set "refresh": true to re-scrape a URL that is already in history.
+    """
     data = request.get_json(force=True, silent=True)
     if not data:
         return jsonify({"error": "Invalid request. Please try again."}), 400
     input_text = (data.get("text") or "").strip()
     input_url = (data.get("url") or "").strip()
     project_id = data.get("project_id")  # None, 0, or positive int
+    refresh = bool(data.get("refresh"))
 
     if not input_text and not input_url:
         return jsonify({"error": "Please provide text or a URL."}), 400
 
+    if data.get("stream") or data.get("background"):
+        job_id = _start_translation_job(input_url, input_text, project_id, refresh)
+        if data.get("background"):
+            return jsonify({"job_id": job_id}), 202
+        return Response(
+            _tail_translation_job(job_id),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Job-Id": job_id},
+        )
+
     try:
         # Get source text
-        article_title = ""
-        article_source_name = ""
-        article_author = ""
-        article_pub_date = ""
-        if input_url:
-            result = fetch_article_from_url(input_url)
-            if isinstance(result, dict):
-                chinese_text = result.get("text", "")
-                article_title = result.get("title", "")
-                article_source_name = result.get("source_name", "")
-                article_author = result.get("author", "")
-                article_pub_date = result.get("pub_date", "")
-            else:
-                chinese_text = result
-        else:
-            chinese_text = input_text
-
-        if not chinese_text:
+        source = _load_source(input_url, input_text, refresh=refresh)
+        if not source["text"]:
             return jsonify({"error": "No text content found."}), 400
 
-        # Translate
-        english_text = translate_chinese_to_english(chinese_text)
+        # Translate and summarize in parallel (both read the Chinese source)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            english_future = pool.submit(translate_chinese_to_english, source["text"])
+            summary_future = pool.submit(generate_summary, source["text"])
+            english_text = english_future.result()
+            summary = summary_future.result()
 
-        # Generate executive summary
-        summary = generate_summary(english_text)
-
-        # Auto-save to history (prepend to Unfiled)
-        conn = get_db()
-        conn.execute(
-            "UPDATE history SET position = position + 1 WHERE folder_id IS NULL"
-        )
-        cur = conn.execute(
-            "INSERT INTO history (url, chinese_text, english_text, summary, title, scraped_source_name, pub_date, author, folder_id, position, project_id, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, 0, ?, ?)",
-            (input_url, chinese_text, english_text, summary, article_title, article_source_name, article_pub_date, article_author, project_id, datetime.now(timezone.utc).isoformat()),
-        )
-        history_id = cur.lastrowid
-        conn.commit()
-
-        # Auto-categorize if article belongs to a project
-        risk_cats = []
-        risk_note = ""
-        if project_id:
-            project_row = conn.execute("SELECT project_name, client_name_cn FROM projects WHERE id = ?", (project_id,)).fetchone()
-            subject = (project_row["client_name_cn"] or project_row["project_name"]) if project_row else ""
-            if subject and summary:
-                try:
-                    result = categorize_article(subject, article_title, summary)
-                    risk_cats = result.get("categories", [])
-                    risk_note = result.get("note", "")
-                    conn.execute(
-                        "UPDATE history SET risk_categories = ?, risk_note = ? WHERE id = ?",
-                        (json.dumps(risk_cats), risk_note, history_id),
-                    )
-                    conn.commit()
-                except Exception:
-                    pass
-
-        conn.close()
-
-        return jsonify({
-            "id": history_id,
-            "chinese": chinese_text,
-            "english": english_text,
-            "summary": summary,
-            "project_id": project_id,
-            "title": article_title,
-            "source_name": article_source_name,
-            "author": article_author,
-            "pub_date": article_pub_date,
-        })
+        return jsonify(_save_translation(input_url, source, english_text, summary, project_id))
 
     except requests.RequestException as e:
         return jsonify({"error": f"Failed to fetch URL: {e}"}), 400
@@ -748,33 +1296,42 @@ def translate():
         return jsonify({"error": f"Translation failed: {e}"}), 500
 
 
+@app.route("/translate/status/<job_id>")
+def translate_status(job_id):
+    """Report a background translation's progress: the source once fetched,
+    the English decoded so far, and the final result or error."""
+    with _jobs_cond:
+        _prune_translation_jobs()
+        job = _jobs.get(job_id)
+        if not job:
+            return jsonify({"error": "Not found"}), 404
+        resp = {"status": job["status"]}
+        if job["result"]:
+            resp["english"] = job["result"]["english"]
+            resp["result"] = job["result"]
+        else:
+            resp["english"] = "".join(job["english"])
+        if job["source"]:
+            resp["source"] = job["source"]
+        if job["error"]:
+            resp["error"] = job["error"]
+    return jsonify(resp)
+
+
 @app.route("/history")
 def history_list():
-    conn = get_db()
-    rows = conn.execute(
-        "SELECT id, url, chinese_text, title, folder_id, position, project_id, created_at FROM history ORDER BY folder_id, position"
-    ).fetchall()
-    conn.close()
-    items = []
-    for r in rows:
-        items.append({
-            "id": r["id"],
-            "url": r["url"],
-            "title": r["title"] or "",
-            "preview": r["chinese_text"][:80],
-            "folder_id": r["folder_id"],
-            "position": r["position"],
-            "project_id": r["project_id"],
-            "created_at": r["created_at"],
-        })
-    return jsonify(items)
+    return _json_array_response(
+        "SELECT json_group_array(json_object("
+        "'id', id, 'url', url, 'title', COALESCE(title, ''), 'preview', substr(chinese_text, 1, 80), "
+        "'folder_id', folder_id, 'position', position, 'project_id', project_id, 'created_at', created_at)) "
+        "FROM (SELECT * FROM history ORDER BY folder_id, position)"
+    )
 
 
 @app.route("/history/<int:entry_id>")
 def history_get(entry_id):
     conn = get_db()
     row = conn.execute("SELECT * FROM history WHERE id = ?", (entry_id,)).fetchone()
-    conn.close()
     if not row:
         return jsonify({"error": "Not found"}), 404
     return jsonify({
@@ -805,13 +1362,10 @@ def history_reanalyze(entry_id):
     conn = get_db()
     row = conn.execute("SELECT title, summary, project_id FROM history WHERE id = ?", (entry_id,)).fetchone()
     if not row:
-        conn.close()
         return jsonify({"error": "Not found"}), 404
     if not row["project_id"]:
-        conn.close()
         return jsonify({"error": "Article not in a project"}), 400
     project = conn.execute("SELECT project_name, client_name_cn FROM projects WHERE id = ?", (row["project_id"],)).fetchone()
-    conn.close()
     subject = (project["client_name_cn"] or project["project_name"]) if project else ""
     if not subject or not row["summary"]:
         return jsonify({"error": "Missing subject or summary"}), 400
@@ -819,13 +1373,11 @@ def history_reanalyze(entry_id):
         result = categorize_article(subject, row["title"] or "", row["summary"])
         cats = result.get("categories", [])
         note = result.get("note", "")
-        conn = get_db()
         conn.execute(
             "UPDATE history SET risk_categories = ?, risk_note = ? WHERE id = ?",
             (json.dumps(cats), note, entry_id),
         )
         conn.commit()
-        conn.close()
         return jsonify({"risk_categories": cats, "risk_note": note})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -837,14 +1389,12 @@ def history_update(entry_id):
     conn = get_db()
     row = conn.execute("SELECT id FROM history WHERE id = ?", (entry_id,)).fetchone()
     if not row:
-        conn.close()
         return jsonify({"error": "Not found"}), 404
     conn.execute(
         "UPDATE history SET notes = ?, highlights_json = ? WHERE id = ?",
         (data.get("notes", ""), data.get("highlights_json", "{}"), entry_id),
     )
     conn.commit()
-    conn.close()
     return jsonify({"ok": True})
 
 
@@ -855,11 +1405,9 @@ def history_rename(entry_id):
     conn = get_db()
     row = conn.execute("SELECT id FROM history WHERE id = ?", (entry_id,)).fetchone()
     if not row:
-        conn.close()
         return jsonify({"error": "Not found"}), 404
     conn.execute("UPDATE history SET title = ? WHERE id = ?", (title, entry_id))
     conn.commit()
-    conn.close()
     return jsonify({"ok": True})
 
 
@@ -868,25 +1416,18 @@ def history_delete(entry_id):
     conn = get_db()
     conn.execute("DELETE FROM history WHERE id = ?", (entry_id,))
     conn.commit()
-    conn.close()
     return jsonify({"ok": True})
 
 
 @app.route("/folders")
 def folders_list():
-    conn = get_db()
-    folders = conn.execute("SELECT * FROM folders ORDER BY position").fetchall()
-    # Get entry counts per folder
-    counts = {}
-    for row in conn.execute("SELECT folder_id, COUNT(*) as cnt FROM history WHERE folder_id IS NOT NULL GROUP BY folder_id").fetchall():
-        counts[row["folder_id"]] = row["cnt"]
-    conn.close()
-    return jsonify([{
-        "id": f["id"],
-        "name": f["name"],
-        "position": f["position"],
-        "entry_count": counts.get(f["id"], 0),
-    } for f in folders])
+    return _json_array_response(
+        "SELECT json_group_array(json_object("
+        "'id', id, 'name', name, 'position', position, 'entry_count', entry_count)) "
+        "FROM (SELECT f.id, f.name, f.position, COUNT(h.id) AS entry_count "
+        "FROM folders f LEFT JOIN history h ON h.folder_id = f.id "
+        "GROUP BY f.id ORDER BY f.position)"
+    )
 
 
 @app.route("/folders", methods=["POST"])
@@ -900,7 +1441,6 @@ def folder_create():
     cur = conn.execute("INSERT INTO folders (name, position) VALUES (?, ?)", (name, max_pos + 1))
     folder_id = cur.lastrowid
     conn.commit()
-    conn.close()
     return jsonify({"id": folder_id, "name": name, "position": max_pos + 1})
 
 
@@ -910,7 +1450,6 @@ def folder_update(folder_id):
     conn = get_db()
     row = conn.execute("SELECT id FROM folders WHERE id = ?", (folder_id,)).fetchone()
     if not row:
-        conn.close()
         return jsonify({"error": "Not found"}), 404
     updates = []
     params = []
@@ -924,18 +1463,17 @@ def folder_update(folder_id):
         params.append(folder_id)
         conn.execute(f"UPDATE folders SET {', '.join(updates)} WHERE id = ?", params)
         conn.commit()
-    conn.close()
     return jsonify({"ok": True})
 
 
 @app.route("/folders/<int:folder_id>", methods=["DELETE"])
 def folder_delete(folder_id):
     conn = get_db()
-    # Move entries back to unfiled
-    conn.execute("UPDATE history SET folder_id = NULL WHERE folder_id = ?", (folder_id,))
-    conn.execute("DELETE FROM folders WHERE id = ?", (folder_id,))
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        # Move entries back to unfiled
+        conn.execute("UPDATE history SET folder_id = NULL WHERE folder_id = ?", (folder_id,))
+        conn.execute("DELETE FROM folders WHERE id = ?", (folder_id,))
     return jsonify({"ok": True})
 
 
@@ -947,61 +1485,112 @@ def folders_reorder():
     for pos, fid in enumerate(order):
         conn.execute("UPDATE folders SET position = ? WHERE id = ?", (pos, fid))
     conn.commit()
-    conn.close()
     return jsonify({"ok": True})
 
 
 @app.route("/history/<int:entry_id>/move", methods=["PUT"])
 def history_move(entry_id):
+    """Move an entry to index `position` among the other entries of a folder.
+
+    Positions are fractional: the entry takes the midpoint of its new
+    neighbours, so only its own row is written. The folder is renumbered
+    only once repeated moves into the same gap exhaust float precision.
+    """
     data = request.get_json(force=True, silent=True) or {}
     folder_id = data.get("folder_id")  # None = unfiled
-    position = data.get("position", 0)
+    try:
+        index = max(int(data.get("position") or 0), 0)
+    except (TypeError, ValueError):
+        return jsonify({"error": "position must be a number"}), 400
     conn = get_db()
-    row = conn.execute("SELECT id, folder_id FROM history WHERE id = ?", (entry_id,)).fetchone()
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT id FROM history WHERE id = ?", (entry_id,)).fetchone()
+        if row:
+            new_position = _position_at(conn, folder_id, entry_id, index)
+            if new_position is None:
+                conn.execute(
+                    "UPDATE history SET position = r.rn FROM ("
+                    "SELECT id, ROW_NUMBER() OVER (ORDER BY position) - 1 AS rn "
+                    "FROM history WHERE folder_id IS ? AND id != ?) AS r WHERE history.id = r.id",
+                    (folder_id, entry_id),
+                )
+                new_position = _position_at(conn, folder_id, entry_id, index)
+            conn.execute(
+                "UPDATE history SET folder_id = ?, position = ? WHERE id = ?",
+                (folder_id, new_position, entry_id),
+            )
     if not row:
-        conn.close()
         return jsonify({"error": "Not found"}), 404
-    # Shift positions in target folder to make room
-    if folder_id is None:
-        conn.execute(
-            "UPDATE history SET position = position + 1 WHERE folder_id IS NULL AND position >= ?",
-            (position,),
-        )
-    else:
-        conn.execute(
-            "UPDATE history SET position = position + 1 WHERE folder_id = ? AND position >= ?",
-            (folder_id, position),
-        )
-    conn.execute(
-        "UPDATE history SET folder_id = ?, position = ? WHERE id = ?",
-        (folder_id, position, entry_id),
-    )
-    conn.commit()
-    conn.close()
     return jsonify({"ok": True})
 
 
+def _position_at(conn, folder_id, entry_id, index):
+    """Return a position that sorts at `index` among a folder's other entries.
+
+    Returns None when the neighbouring positions are too close to split.
+    """
+    neighbours = conn.execute(
+        "SELECT position FROM history WHERE folder_id IS ? AND id != ? "
+        "ORDER BY position LIMIT 2 OFFSET ?",
+        (folder_id, entry_id, max(index - 1, 0)),
+    ).fetchall()
+    if index == 0:
+        return neighbours[0]["position"] - 1 if neighbours else 0
+    if not neighbours:
+        # Past the end: append after the last entry
+        last = conn.execute(
+            "SELECT MAX(position) FROM history WHERE folder_id IS ? AND id != ?",
+            (folder_id, entry_id),
+        ).fetchone()[0]
+        return 0 if last is None else last + 1
+    if len(neighbours) == 1:
+        return neighbours[0]["position"] + 1
+    before, after = neighbours[0]["position"], neighbours[1]["position"]
+    midpoint = (before + after) / 2
+    if not before < midpoint < after:
+        return None
+    return midpoint
+
+
+# Distinguishes this process's ETags from those issued against an earlier
+# database file, whose version counters may have restarted
+_ETAG_SALT = uuid.uuid4().hex[:8]
+
+
+def _list_etag(name):
+    """Weak ETag for a list endpoint, taken from its data_versions counter."""
+    version = get_db().execute("SELECT version FROM data_versions WHERE name = ?", (name,)).fetchone()[0]
+    return f"{_ETAG_SALT}-{name}-{version}"
+
+
+def _with_etag(resp, etag):
+    # no-cache: the browser may keep the list but must revalidate it each time
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
 @app.route("/sources")
 def sources_list():
+    etag = _list_etag("sources")
+    if request.if_none_match.contains_weak(etag):
+        return _with_etag(Response(status=304), etag)
     conn = get_db()
-    rows = conn.execute("SELECT * FROM sources ORDER BY name").fetchall()
-    # Get article counts per source
-    counts = {}
-    for row in conn.execute(
-        "SELECT source_id, COUNT(*) as cnt FROM history WHERE source_id IS NOT NULL GROUP BY source_id"
-    ).fetchall():
-        counts[row["source_id"]] = row["cnt"]
-    conn.close()
-    return jsonify([{
-        "id": r["id"],
-        "name": r["name"],
-        "type": r["type"],
-        "credibility_tier": r["credibility_tier"],
-        "language": r["language"],
-        "notes": r["notes"],
-        "article_count": counts.get(r["id"], 0),
-        "created_at": r["created_at"],
-    } for r in rows])
+    rows = conn.execute(
+        "SELECT s.id, s.name, s.type, s.credibility_tier, s.language, s.notes, COUNT(h.id), s.created_at "
+        "FROM sources s LEFT JOIN history h ON h.source_id = s.id GROUP BY s.id ORDER BY s.name"
+    ).fetchall()
+    return _with_etag(jsonify([{
+        "id": id_,
+        "name": name,
+        "type": type_,
+        "credibility_tier": tier,
+        "language": language,
+        "notes": notes,
+        "article_count": article_count,
+        "created_at": created_at,
+    } for id_, name, type_, tier, language, notes, article_count, created_at in rows]), etag)
 
 
 @app.route("/sources", methods=["POST"])
@@ -1024,39 +1613,49 @@ def source_create():
     )
     source_id = cur.lastrowid
     conn.commit()
-    conn.close()
     return jsonify({"id": source_id, "name": name})
 
 
+def _partial_update_sql(table, fields):
+    """Build an UPDATE that sets each field from a parameter, keeping the
+    current value where the parameter is NULL.
+
+    The statement text is the same whichever fields a request sends, so
+    SQLite's statement cache reuses one compiled statement.
+    """
+    sets = ", ".join(f"{field} = COALESCE(?, {field})" for field in fields)
+    return f"UPDATE {table} SET {sets} WHERE id = ?"
+
+
+def _partial_update_params(data, fields):
+    """Stripped values for the fields present in data, None for the rest."""
+    return [(data[field] or "").strip() if field in data else None for field in fields]
+
+
+SOURCE_EDIT_FIELDS = ("name", "type", "credibility_tier", "language", "notes")
+_SOURCE_UPDATE_SQL = _partial_update_sql("sources", SOURCE_EDIT_FIELDS)
+
+
 @app.route("/sources/<int:source_id>", methods=["PUT"])
 def source_update(source_id):
     data = request.get_json(force=True, silent=True) or {}
     conn = get_db()
     row = conn.execute("SELECT id FROM sources WHERE id = ?", (source_id,)).fetchone()
     if not row:
-        conn.close()
         return jsonify({"error": "Not found"}), 404
-    updates = []
-    params = []
-    for field in ("name", "type", "credibility_tier", "language", "notes"):
-        if field in data:
-            updates.append(f"{field} = ?")
-            params.append((data[field] or "").strip())
-    if updates:
-        params.append(source_id)
-        conn.execute(f"UPDATE sources SET {', '.join(updates)} WHERE id = ?", params)
+    if any(field in data for field in SOURCE_EDIT_FIELDS):
+        conn.execute(_SOURCE_UPDATE_SQL, _partial_update_params(data, SOURCE_EDIT_FIELDS) + [source_id])
         conn.commit()
-    conn.close()
     return jsonify({"ok": True})
 
 
 @app.route("/sources/<int:source_id>", methods=["DELETE"])
 def source_delete(source_id):
     conn = get_db()
-    conn.execute("UPDATE history SET source_id = NULL WHERE source_id = ?", (source_id,))
-    conn.execute("DELETE FROM sources WHERE id = ?", (source_id,))
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("UPDATE history SET source_id = NULL WHERE source_id = ?", (source_id,))
+        conn.execute("DELETE FROM sources WHERE id = ?", (source_id,))
     return jsonify({"ok": True})
 
 
@@ -1067,60 +1666,54 @@ def history_set_source(entry_id):
     conn = get_db()
     row = conn.execute("SELECT id FROM history WHERE id = ?", (entry_id,)).fetchone()
     if not row:
-        conn.close()
         return jsonify({"error": "Not found"}), 404
     conn.execute("UPDATE history SET source_id = ? WHERE id = ?", (source_id, entry_id))
     conn.commit()
-    conn.close()
     return jsonify({"ok": True})
 
 
+HISTORY_METADATA_FIELDS = ("title", "article_title_en", "scraped_source_name", "source_name_en", "author", "pub_date", "url")
+_HISTORY_METADATA_UPDATE_SQL = _partial_update_sql("history", HISTORY_METADATA_FIELDS)
+
+
 @app.route("/history/<int:entry_id>/metadata", methods=["PUT"])
 def history_update_metadata(entry_id):
     data = request.get_json(force=True, silent=True) or {}
     conn = get_db()
     row = conn.execute("SELECT id FROM history WHERE id = ?", (entry_id,)).fetchone()
     if not row:
-        conn.close()
         return jsonify({"error": "Not found"}), 404
-    updates = []
-    params = []
-    for field in ("title", "article_title_en", "scraped_source_name", "source_name_en", "author", "pub_date", "url"):
-        if field in data:
-            updates.append(f"{field} = ?")
-            params.append((data[field] or "").strip())
-    if updates:
-        params.append(entry_id)
-        conn.execute(f"UPDATE history SET {', '.join(updates)} WHERE id = ?", params)
+    if any(field in data for field in HISTORY_METADATA_FIELDS):
+        conn.execute(_HISTORY_METADATA_UPDATE_SQL, _partial_update_params(data, HISTORY_METADATA_FIELDS) + [entry_id])
         conn.commit()
-    conn.close()
     return jsonify({"ok": True})
 
 
 @app.route("/projects")
 def projects_list():
+    etag = _list_etag("projects")
+    if request.if_none_match.contains_weak(etag):
+        return _with_etag(Response(status=304), etag)
     conn = get_db()
     rows = conn.execute(
-        "SELECT * FROM projects ORDER BY CASE WHEN due_by IS NULL OR due_by = '' THEN 1 ELSE 0 END, due_by ASC, created_at DESC"
+        "SELECT p.id, p.project_name, p.client_name_cn, p.client_name_en, p.industry, p.status, p.notes, "
+        "p.due_by, COUNT(h.id), p.created_at FROM projects p "
+        "LEFT JOIN history h ON h.project_id = p.id GROUP BY p.id "
+        "ORDER BY CASE WHEN p.due_by IS NULL OR p.due_by = '' THEN 1 ELSE 0 END, p.due_by ASC, p.created_at DESC"
     ).fetchall()
-    counts = {}
-    for row in conn.execute(
-        "SELECT project_id, COUNT(*) as cnt FROM history WHERE project_id IS NOT NULL GROUP BY project_id"
-    ).fetchall():
-        counts[row["project_id"]] = row["cnt"]
-    conn.close()
-    return jsonify([{
-        "id": r["id"],
-        "project_name": r["project_name"] or "",
-        "client_name_cn": r["client_name_cn"],
-        "client_name_en": r["client_name_en"],
-        "industry": r["industry"],
-        "status": r["status"],
-        "notes": r["notes"],
-        "due_by": r["due_by"] or "",
-        "article_count": counts.get(r["id"], 0),
-        "created_at": r["created_at"],
-    } for r in rows])
+    return _with_etag(jsonify([{
+        "id": id_,
+        "project_name": project_name or "",
+        "client_name_cn": client_cn,
+        "client_name_en": client_en,
+        "industry": industry,
+        "status": status,
+        "notes": notes,
+        "due_by": due_by or "",
+        "article_count": article_count,
+        "created_at": created_at,
+    } for (id_, project_name, client_cn, client_en, industry, status, notes,
+           due_by, article_count, created_at) in rows]), etag)
 
 
 @app.route("/projects", methods=["POST"])
@@ -1141,7 +1734,6 @@ def project_create():
     )
     project_id = cur.lastrowid
     conn.commit()
-    conn.close()
     return jsonify({"id": project_id})
 
 
@@ -1149,7 +1741,6 @@ def project_create():
 def project_get(project_id):
     conn = get_db()
     row = conn.execute("SELECT * FROM projects WHERE id = ?", (project_id,)).fetchone()
-    conn.close()
     if not row:
         return jsonify({"error": "Not found"}), 404
     return jsonify({
@@ -1166,36 +1757,31 @@ def project_get(project_id):
     })
 
 
+PROJECT_EDIT_FIELDS = ("project_name", "client_name_cn", "client_name_en", "report_type", "industry", "status", "notes", "due_by")
+_PROJECT_UPDATE_SQL = _partial_update_sql("projects", PROJECT_EDIT_FIELDS)
+
+
 @app.route("/projects/<int:project_id>", methods=["PUT"])
 def project_update(project_id):
     data = request.get_json(force=True, silent=True) or {}
     conn = get_db()
     row = conn.execute("SELECT id FROM projects WHERE id = ?", (project_id,)).fetchone()
     if not row:
-        conn.close()
         return jsonify({"error": "Not found"}), 404
-    updates = []
-    params = []
-    for field in ("project_name", "client_name_cn", "client_name_en", "report_type", "industry", "status", "notes", "due_by"):
-        if field in data:
-            updates.append(f"{field} = ?")
-            params.append((data[field] or "").strip())
-    if updates:
-        params.append(project_id)
-        conn.execute(f"UPDATE projects SET {', '.join(updates)} WHERE id = ?", params)
+    if any(field in data for field in PROJECT_EDIT_FIELDS):
+        conn.execute(_PROJECT_UPDATE_SQL, _partial_update_params(data, PROJECT_EDIT_FIELDS) + [project_id])
         conn.commit()
-    conn.close()
     return jsonify({"ok": True})
 
 
 @app.route("/projects/<int:project_id>", methods=["DELETE"])
 def project_delete(project_id):
     conn = get_db()
-    # Move linked articles to unfiled
-    conn.execute("UPDATE history SET project_id = NULL WHERE project_id = ?", (project_id,))
-    conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        # Move linked articles to unfiled
+        conn.execute("UPDATE history SET project_id = NULL WHERE project_id = ?", (project_id,))
+        conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
     return jsonify({"ok": True})
 
 
@@ -1203,31 +1789,23 @@ def project_delete(project_id):
 def project_articles(project_id):
     conn = get_db()
     rows = conn.execute(
-        "SELECT id, url, chinese_text, english_text, summary, title, source_id, highlights_json, pub_date, created_at FROM history WHERE project_id = ? ORDER BY created_at DESC",
+        # highlight_count: occurrences of "<mark" (5 chars) in the saved highlight HTML
+        "SELECT id, url, title, substr(chinese_text, 1, 80), summary, source_id, "
+        "(LENGTH(IFNULL(highlights_json, '')) - LENGTH(REPLACE(IFNULL(highlights_json, ''), '<mark', ''))) / 5, "
+        "pub_date, created_at FROM history WHERE project_id = ? ORDER BY created_at DESC",
         (project_id,),
     ).fetchall()
-    conn.close()
-    items = []
-    for r in rows:
-        hl_count = 0
-        try:
-            hl_data = json.loads(r["highlights_json"] or "{}")
-            for panel_html in hl_data.values():
-                hl_count += panel_html.count("<mark")
-        except (json.JSONDecodeError, AttributeError):
-            pass
-        items.append({
-            "id": r["id"],
-            "url": r["url"],
-            "title": r["title"] or "",
-            "preview": r["chinese_text"][:80],
-            "summary": r["summary"] or "",
-            "source_id": r["source_id"],
-            "highlight_count": hl_count,
-            "pub_date": r["pub_date"] or "",
-            "created_at": r["created_at"],
-        })
-    return jsonify(items)
+    return jsonify([{
+        "id": id_,
+        "url": url,
+        "title": title or "",
+        "preview": preview,
+        "summary": summary or "",
+        "source_id": source_id,
+        "highlight_count": highlight_count,
+        "pub_date": pub_date or "",
+        "created_at": created_at,
+    } for id_, url, title, preview, summary, source_id, highlight_count, pub_date, created_at in rows])
 
 
 @app.route("/projects/<int:project_id>/risk-summary")
@@ -1235,13 +1813,11 @@ def project_risk_summary(project_id):
     conn = get_db()
     project = conn.execute("SELECT project_name, client_name_cn, risk_synthesis, risk_synthesis_updated_at FROM projects WHERE id = ?", (project_id,)).fetchone()
     if not project:
-        conn.close()
         return jsonify({"error": "Not found"}), 404
     articles = conn.execute(
         "SELECT id, title, risk_categories, risk_note FROM history WHERE project_id = ? ORDER BY created_at",
         (project_id,),
     ).fetchall()
-    conn.close()
 
     # Build per-category article lists
     category_map = {c["key"]: {"label": c["label"], "group": c["group"], "articles": []} for c in RISK_CATEGORIES}
@@ -1269,14 +1845,12 @@ def project_categorize_all(project_id):
     conn = get_db()
     project = conn.execute("SELECT project_name, client_name_cn FROM projects WHERE id = ?", (project_id,)).fetchone()
     if not project:
-        conn.close()
         return jsonify({"error": "Not found"}), 404
     subject = project["client_name_cn"] or project["project_name"] or ""
     articles = conn.execute(
         "SELECT id, title, summary FROM history WHERE project_id = ? AND (risk_categories IS NULL OR risk_categories = '')",
         (project_id,),
     ).fetchall()
-    conn.close()
 
     count = 0
     for a in articles:
@@ -1284,13 +1858,11 @@ def project_categorize_all(project_id):
             continue
         try:
             result = categorize_article(subject, a["title"] or "", a["summary"])
-            conn = get_db()
             conn.execute(
                 "UPDATE history SET risk_categories = ?, risk_note = ? WHERE id = ?",
                 (json.dumps(result.get("categories", [])), result.get("note", ""), a["id"]),
             )
             conn.commit()
-            conn.close()
             count += 1
         except Exception:
             pass
@@ -1302,30 +1874,101 @@ def project_update_synthesis(project_id):
     conn = get_db()
     project = conn.execute("SELECT project_name, client_name_cn FROM projects WHERE id = ?", (project_id,)).fetchone()
     if not project:
-        conn.close()
         return jsonify({"error": "Not found"}), 404
     subject = project["client_name_cn"] or project["project_name"] or ""
     articles = conn.execute(
         "SELECT title, risk_categories, risk_note FROM history WHERE project_id = ? ORDER BY created_at",
         (project_id,),
     ).fetchall()
-    conn.close()
 
     try:
         synthesis = generate_risk_synthesis(subject, [dict(a) for a in articles])
         now = datetime.now(timezone.utc).isoformat()
-        conn = get_db()
         conn.execute(
             "UPDATE projects SET risk_synthesis = ?, risk_synthesis_updated_at = ? WHERE id = ?",
             (synthesis, now, project_id),
         )
         conn.commit()
-        conn.close()
         return jsonify({"synthesis": synthesis, "updated_at": now})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+ENTITY_SYSTEM_PROMPT = (
+    "You are an entity extraction assistant. Extract all key entities (people, companies, organizations, government bodies, locations, laws/regulations) "
+    "from the provided article summaries. For each entity, count how many DISTINCT articles it appears in. "
+    "Return ONLY a JSON array sorted by count descending, like: [{\"entity\": \"Name\", \"type\": \"person\", \"count\": 3}, ...]. "
+    "Use these types: person, company, organization, government, location, regulation, other. "
+    "Include both Chinese and English names if both appear — combine them as one entry using the format 'English Name (中文名)'. "
+    "Do not include generic terms. Only return the JSON array, no other text."
+)
+
+# Large projects are extracted in batches of this many summaries, sent as
+# concurrent requests, so no single response runs into max_tokens.
+ENTITY_CHUNK_ARTICLES = 20
+ENTITY_WORKERS = 4
+# Per-batch results keyed by the batch's summaries tuple, so re-running a
+# project only re-sends the batches whose summaries changed
+ENTITY_CACHE_SIZE = 256
+_entity_cache = OrderedDict()
+_entity_cache_lock = threading.Lock()
+
+
+def _extract_entities_chunk(summaries, force=False):
+    """Extract entities from a tuple of summaries with one DeepSeek call.
+
+    Results are cached by content; force skips the lookup but still stores
+    the fresh result. Callers must not mutate the returned list.
+    """
+    with _entity_cache_lock:
+        hit = None if force else _entity_cache.get(summaries)
+        if hit is not None:
+            _entity_cache.move_to_end(summaries)
+            return hit
+    combined = "\n\n".join(f"Article {i+1}:\n{s}" for i, s in enumerate(summaries))
+    resp = client.chat.completions.create(
+        model="deepseek-chat",
+        messages=[
+            {"role": "system", "content": ENTITY_SYSTEM_PROMPT},
+            {"role": "user", "content": combined},
+        ],
+        max_tokens=8000,
+    )
+    raw = resp.choices[0].message.content.strip()
+    if "```" in raw:
+        raw = raw.split("```", 1)[1]          # drop everything before first ```
+        raw = raw.split("\n", 1)[-1]           # drop the language tag line (e.g. "json")
+        raw = raw.rsplit("```", 1)[0].strip()  # drop closing ```
+    entities = json.loads(raw)
+    with _entity_cache_lock:
+        _entity_cache[summaries] = entities
+        _entity_cache.move_to_end(summaries)
+        while len(_entity_cache) > ENTITY_CACHE_SIZE:
+            _entity_cache.popitem(last=False)
+    return entities
+
+
+def _extract_entities(summaries, force=False):
+    """Extract entities across all summaries, merging per-batch counts by name.
+
+    force re-sends every batch and replaces its cached result.
+    """
+    chunks = [tuple(summaries[i:i + ENTITY_CHUNK_ARTICLES]) for i in range(0, len(summaries), ENTITY_CHUNK_ARTICLES)]
+    if len(chunks) == 1:
+        return _extract_entities_chunk(chunks[0], force)
+    with ThreadPoolExecutor(max_workers=ENTITY_WORKERS) as pool:
+        results = list(pool.map(_extract_entities_chunk, chunks, [force] * len(chunks)))
+    merged = {}
+    for entities in results:
+        for e in entities:
+            name = (e.get("entity") or "").strip()
+            if not name:
+                continue
+            entry = merged.setdefault(name, {"entity": name, "type": e.get("type") or "other", "count": 0})
+            entry["count"] += int(e.get("count") or 0)
+    return sorted(merged.values(), key=itemgetter("count"), reverse=True)
+
+
 @app.route("/projects/<int:project_id>/entities")
 def project_entities(project_id):
     """Return cached entities — no AI call."""
@@ -1333,7 +1976,6 @@ def project_entities(project_id):
     row = conn.execute(
         "SELECT entities_cache, entities_updated_at FROM projects WHERE id = ?", (project_id,)
     ).fetchone()
-    conn.close()
     if not row or not row["entities_cache"]:
         return jsonify({"entities": [], "updated_at": ""})
     try:
@@ -1344,48 +1986,41 @@ def project_entities(project_id):
 
 @app.route("/projects/<int:project_id>/update-entities", methods=["POST"])
 def project_update_entities(project_id):
-    """Re-run entity extraction across all articles and cache the result."""
+    """Re-run entity extraction across all articles and cache the result.
+
+    Skipped when the project's summaries are unchanged since the cached run,
+    unless the request body sets "force": true.
+    """
+    force = bool((request.get_json(force=True, silent=True) or {}).get("force"))
     conn = get_db()
     rows = conn.execute(
-        "SELECT summary FROM history WHERE project_id = ? AND summary IS NOT NULL AND summary != ''",
+        # Creation order keeps earlier chunks stable as articles are added
+        "SELECT summary FROM history WHERE project_id = ? AND summary IS NOT NULL AND summary != '' ORDER BY id",
         (project_id,),
     ).fetchall()
-    conn.close()
     summaries = [r["summary"] for r in rows]
     if not summaries:
         return jsonify({"entities": [], "updated_at": ""})
 
-    combined = "\n\n".join(f"Article {i+1}:\n{s}" for i, s in enumerate(summaries))
+    summaries_hash = hashlib.blake2b(
+        b"\0".join(s.encode() for s in sorted(summaries)), digest_size=16
+    ).hexdigest()
+    cached = conn.execute(
+        "SELECT entities_cache, entities_updated_at, entities_summaries_hash FROM projects WHERE id = ?",
+        (project_id,),
+    ).fetchone()
+    if not force and cached and cached["entities_cache"] and cached["entities_summaries_hash"] == summaries_hash:
+        return jsonify({"entities": json.loads(cached["entities_cache"]),
+                        "updated_at": cached["entities_updated_at"] or "", "unchanged": True})
+
     try:
-        resp = client.chat.completions.create(
-            model="deepseek-chat",
-            messages=[
-                {"role": "system", "content": (
-                    "You are an entity extraction assistant. Extract all key entities (people, companies, organizations, government bodies, locations, laws/regulations) "
-                    "from the provided article summaries. For each entity, count how many DISTINCT articles it appears in. "
-                    "Return ONLY a JSON array sorted by count descending, like: [{\"entity\": \"Name\", \"type\": \"person\", \"count\": 3}, ...]. "
-                    "Use these types: person, company, organization, government, location, regulation, other. "
-                    "Include both Chinese and English names if both appear — combine them as one entry using the format 'English Name (中文名)'. "
-                    "Do not include generic terms. Only return the JSON array, no other text."
-                )},
-                {"role": "user", "content": combined},
-            ],
-            max_tokens=8000,
-        )
-        raw = resp.choices[0].message.content.strip()
-        if "```" in raw:
-            raw = raw.split("```", 1)[1]          # drop everything before first ```
-            raw = raw.split("\n", 1)[-1]           # drop the language tag line (e.g. "json")
-            raw = raw.rsplit("```", 1)[0].strip()  # drop closing ```
-        entities = json.loads(raw)
+        entities = _extract_entities(summaries, force=force)
         now = datetime.now(timezone.utc).isoformat()
-        conn = get_db()
         conn.execute(
-            "UPDATE projects SET entities_cache = ?, entities_updated_at = ? WHERE id = ?",
-            (json.dumps(entities), now, project_id),
+            "UPDATE projects SET entities_cache = ?, entities_updated_at = ?, entities_summaries_hash = ? WHERE id = ?",
+            (json.dumps(entities), now, summaries_hash, project_id),
         )
         conn.commit()
-        conn.close()
         return jsonify({"entities": entities, "updated_at": now})
     except Exception as e:
         print(f"Entity extraction error: {e}")
@@ -1399,11 +2034,9 @@ def history_set_project(entry_id):
     conn = get_db()
     row = conn.execute("SELECT id FROM history WHERE id = ?", (entry_id,)).fetchone()
     if not row:
-        conn.close()
         return jsonify({"error": "Not found"}), 404
     conn.execute("UPDATE history SET project_id = ? WHERE id = ?", (project_id, entry_id))
     conn.commit()
-    conn.close()
     return jsonify({"ok": True})
 
 
@@ -1411,25 +2044,24 @@ def history_set_project(entry_id):
 def unfiled_articles():
     conn = get_db()
     rows = conn.execute(
-        "SELECT id, url, chinese_text, title, summary, created_at FROM history WHERE project_id IS NULL ORDER BY created_at DESC"
+        "SELECT id, url, title, substr(chinese_text, 1, 80), summary, created_at "
+        "FROM history WHERE project_id IS NULL ORDER BY created_at DESC"
     ).fetchall()
-    conn.close()
     return jsonify([{
-        "id": r["id"],
-        "url": r["url"],
-        "title": r["title"] or "",
-        "preview": r["chinese_text"][:80],
-        "summary": r["summary"] or "",
-        "created_at": r["created_at"],
-    } for r in rows])
+        "id": id_,
+        "url": url,
+        "title": title or "",
+        "preview": preview,
+        "summary": summary or "",
+        "created_at": created_at,
+    } for id_, url, title, preview, summary, created_at in rows])
 
 
-def _build_citation(style, title, source_name, date, url):
-    """Generate a citation string in the given style."""
+def _build_citation(style, title, source_name, date, url, today):
+    """Generate a citation string in the given style. today is the access date."""
     pub = source_name or "Unknown Source"
     title = title or "(Untitled Article)"
     date = date or "n.d."
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
     if style == "footnote":
         parts = f'"{title}," {pub} (Chinese), {date}'
@@ -1452,26 +2084,26 @@ def _build_citation(style, title, source_name, date, url):
 def project_export_pdf(project_id):
     data = request.get_json(force=True, silent=True) or {}
     citation_style = data.get("citation_style", "inline")
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
     conn = get_db()
-    project = conn.execute("SELECT * FROM projects WHERE id = ?", (project_id,)).fetchone()
+    project = conn.execute(
+        "SELECT project_name, client_name_en, client_name_cn, industry, status, due_by, notes FROM projects WHERE id = ?",
+        (project_id,),
+    ).fetchone()
     if not project:
-        conn.close()
         return jsonify({"error": "Not found"}), 404
 
+    # source_name is NULL unless the article is linked to a saved source
     articles = conn.execute(
-        "SELECT id, url, title, summary, source_id, scraped_source_name, pub_date, created_at FROM history WHERE project_id = ? ORDER BY created_at",
+        "SELECT h.id, h.url, h.title, h.summary, h.scraped_source_name, h.pub_date, h.created_at, "
+        "s.name AS source_name, s.credibility_tier "
+        "FROM history h LEFT JOIN sources s ON s.id = h.source_id "
+        "WHERE h.project_id = ? ORDER BY h.created_at",
         (project_id,),
     ).fetchall()
-
-    # Build source lookup
-    source_ids = set(a["source_id"] for a in articles if a["source_id"])
-    sources = {}
-    if source_ids:
-        placeholders = ",".join("?" * len(source_ids))
-        for s in conn.execute(f"SELECT * FROM sources WHERE id IN ({placeholders})", list(source_ids)).fetchall():
-            sources[s["id"]] = dict(s)
-    conn.close()
+    # Report date per article: publication date, falling back to when it was saved
+    dated_articles = [((a["pub_date"] or a["created_at"] or "")[:10], a) for a in articles]
 
     pdf = FPDF()
     pdf.set_auto_page_break(auto=True, margin=20)
@@ -1486,7 +2118,7 @@ def project_export_pdf(project_id):
     # Title — project name + "Report"
     proj_title = project["project_name"] or project["client_name_en"] or project["client_name_cn"] or "Project"
     report_title = f"{proj_title} Report"
-    _pdf_set_font(pdf, cjk_font, "B", 18, report_title)
+    _pdf_set_font(pdf, cjk_font, "B", 18)
     pdf.set_text_color(26, 26, 26)
     pdf.multi_cell(0, 12, report_title)
     pdf.set_draw_color(74, 144, 217)
@@ -1496,7 +2128,7 @@ def project_export_pdf(project_id):
     # Date
     _pdf_set_font(pdf, cjk_font, "", 9)
     pdf.set_text_color(136, 136, 136)
-    pdf.cell(0, PDF_LINE_H_SMALL, f"Generated {datetime.now(timezone.utc).strftime('%Y-%m-%d')}", new_x="LMARGIN", new_y="NEXT")
+    pdf.cell(0, PDF_LINE_H_SMALL, f"Generated {today}", new_x="LMARGIN", new_y="NEXT")
     pdf.ln(6)
 
     # Client Profile
@@ -1524,25 +2156,21 @@ def project_export_pdf(project_id):
 
     pdf.set_fill_color(245, 248, 255)
     profile_text = "\n".join(profile_lines)
-    _pdf_set_font(pdf, cjk_font, "", 10, profile_text)
+    _pdf_set_font(pdf, cjk_font, "", 10)
     pdf.multi_cell(0, PDF_LINE_H, profile_text, fill=True)
     pdf.ln(6)
 
     # Timeline (sorted by pub_date, fallback to created_at)
     if articles:
-        sorted_articles = sorted(
-            articles,
-            key=lambda a: (a["pub_date"] or a["created_at"] or "")[:10],
-        )
+        sorted_articles = sorted(dated_articles, key=itemgetter(0))
         _pdf_set_font(pdf, cjk_font, "B", 13)
         pdf.set_text_color(74, 144, 217)
         pdf.cell(0, 8, "Chronological Timeline", new_x="LMARGIN", new_y="NEXT")
         pdf.ln(2)
         pdf.set_text_color(51, 51, 51)
-        for a in sorted_articles:
-            date_str = (a["pub_date"] or a["created_at"] or "")[:10]
+        for date_str, a in sorted_articles:
             title = a["title"] or a["url"] or "(untitled)"
-            _pdf_set_font(pdf, cjk_font, "", 10, title)
+            _pdf_set_font(pdf, cjk_font, "", 10)
             pdf.cell(0, PDF_LINE_H, f"{date_str}  -  {title}", new_x="LMARGIN", new_y="NEXT")
         pdf.ln(6)
 
@@ -1553,19 +2181,18 @@ def project_export_pdf(project_id):
         pdf.cell(0, 8, "Article Details", new_x="LMARGIN", new_y="NEXT")
         pdf.ln(2)
 
-        for a in articles:
+        for cite_date, a in dated_articles:
             title = a["title"] or a["url"] or "(untitled)"
-            _pdf_set_font(pdf, cjk_font, "B", 11, title)
+            _pdf_set_font(pdf, cjk_font, "B", 11)
             pdf.set_text_color(26, 26, 26)
             pdf.cell(0, PDF_LINE_H, title, new_x="LMARGIN", new_y="NEXT")
 
             pdf.set_text_color(136, 136, 136)
             meta_parts = [a["created_at"][:10] if a["created_at"] else ""]
-            if a["source_id"] and a["source_id"] in sources:
-                s = sources[a["source_id"]]
-                meta_parts.append(f"{s['name']} ({s.get('credibility_tier', '')})")
+            if a["source_name"] is not None:
+                meta_parts.append(f"{a['source_name']} ({a['credibility_tier']})")
             meta_text = " | ".join(filter(None, meta_parts))
-            _pdf_set_font(pdf, cjk_font, "", 9, meta_text)
+            _pdf_set_font(pdf, cjk_font, "", 9)
             pdf.cell(0, PDF_LINE_H_SMALL, meta_text, new_x="LMARGIN", new_y="NEXT")
 
             if a["summary"]:
@@ -1574,35 +2201,42 @@ def project_export_pdf(project_id):
                 _pdf_write_paragraphs(pdf, a["summary"], cjk_font, fill=True)
 
             # Citation
-            source_name = ""
-            if a["source_id"] and a["source_id"] in sources:
-                source_name = sources[a["source_id"]]["name"]
-            if not source_name:
-                source_name = a["scraped_source_name"] or ""
-            cite_date = (a["pub_date"] or a["created_at"] or "")[:10]
+            source_name = a["source_name"] or a["scraped_source_name"] or ""
             cit = _build_citation(
                 citation_style,
                 a["title"] or "",
                 source_name,
                 cite_date,
                 a["url"] or "",
+                today,
             )
             pdf.ln(2)
-            _pdf_set_font(pdf, cjk_font, "", 9, cit)
+            _pdf_set_font(pdf, cjk_font, "", 9)
             pdf.set_text_color(100, 100, 100)
             pdf.multi_cell(0, PDF_LINE_H_SMALL, cit)
             pdf.ln(4)
 
+    return _pdf_response(pdf, f"project-report-{project_id}-{today}.pdf")
+
+
+def _pdf_response(pdf, download_name):
+    """Send a finished PDF as a download.
+
+    The bytearray fpdf2 renders into is used as the response body directly
+    (no BytesIO copy), and its length is sent as Content-Length.
+    """
     try:
-        buf = BytesIO(pdf.output())
+        data = pdf.output()
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    buf.seek(0)
-    return send_file(
-        buf,
+    return Response(
+        data,
         mimetype="application/pdf",
-        as_attachment=True,
-        download_name=f"project-report-{project_id}-{datetime.now(timezone.utc).strftime('%Y-%m-%d')}.pdf",
+        headers={
+            "Content-Disposition": f'attachment; filename="{download_name}"',
+            "Content-Length": str(len(data)),
+            "Cache-Control": "no-cache",
+        },
     )
 
 
@@ -1632,7 +2266,7 @@ PDF_LINE_H = 6
 PDF_LINE_H_SMALL = 5
 
 
-def _pdf_set_font(pdf, cjk_font, style, size, text=""):
+def _pdf_set_font(pdf, cjk_font, style, size):
     """Set PDF font, preferring CJK font when available."""
     if cjk_font:
         pdf.set_font(cjk_font, style, size)
@@ -1643,8 +2277,8 @@ def _pdf_set_font(pdf, cjk_font, style, size, text=""):
 def _pdf_write_paragraphs(pdf, text, cjk_font, size=10, line_h=PDF_LINE_H, fill=False):
     """Write text with clean paragraph breaks. Each paragraph separated by spacing."""
     paragraphs = [p.strip() for p in text.split("\n") if p.strip()]
+    _pdf_set_font(pdf, cjk_font, "", size)
     for i, para in enumerate(paragraphs):
-        _pdf_set_font(pdf, cjk_font, "", size, para)
         pdf.multi_cell(0, line_h, para, fill=fill)
         if i < len(paragraphs) - 1:
             pdf.ln(line_h * 0.5)
@@ -1670,6 +2304,7 @@ def export_pdf():
     url = data.get("url", "")
     citation = data.get("citation", "")
     article_title = data.get("title", "")
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
     pdf = FPDF()
     pdf.set_auto_page_break(auto=True, margin=20)
@@ -1684,7 +2319,7 @@ def export_pdf():
 
     # Title — article name + "Report"
     report_title = f"{article_title} Report" if article_title else "Research Report"
-    _pdf_set_font(pdf, cjk_font, "B", 18, report_title)
+    _pdf_set_font(pdf, cjk_font, "B", 18)
     pdf.set_text_color(26, 26, 26)
     pdf.multi_cell(0, 12, report_title)
     pdf.set_draw_color(74, 144, 217)
@@ -1694,7 +2329,7 @@ def export_pdf():
     # Date + source
     _pdf_set_font(pdf, cjk_font, "", 9)
     pdf.set_text_color(136, 136, 136)
-    pdf.cell(0, PDF_LINE_H_SMALL, f"Generated {datetime.now(timezone.utc).strftime('%Y-%m-%d')}", new_x="LMARGIN", new_y="NEXT")
+    pdf.cell(0, PDF_LINE_H_SMALL, f"Generated {today}", new_x="LMARGIN", new_y="NEXT")
     if url:
         pdf.cell(0, PDF_LINE_H_SMALL, f"Source: {url}", new_x="LMARGIN", new_y="NEXT")
     pdf.ln(6)
@@ -1711,7 +2346,7 @@ def export_pdf():
         pdf.ln(6)
 
     # Chinese section
-    _pdf_set_font(pdf, cjk_font, "B", 13, "Original Chinese 原文")
+    _pdf_set_font(pdf, cjk_font, "B", 13)
     pdf.set_text_color(74, 144, 217)
     pdf.cell(0, 8, "Original Chinese", new_x="LMARGIN", new_y="NEXT")
     pdf.ln(2)
@@ -1740,7 +2375,7 @@ def export_pdf():
             pdf.set_fill_color(*rgb)
             pdf.set_text_color(51, 51, 51)
             text = h.get("text", "")
-            _pdf_set_font(pdf, cjk_font, "", 10, text)
+            _pdf_set_font(pdf, cjk_font, "", 10)
             pdf.multi_cell(0, PDF_LINE_H, f"[{color_name.upper()}] {text}", fill=True)
             pdf.ln(1)
         pdf.ln(4)
@@ -1764,20 +2399,10 @@ def export_pdf():
         pdf.ln(2)
         pdf.set_text_color(51, 51, 51)
         pdf.set_fill_color(245, 248, 255)
-        _pdf_set_font(pdf, cjk_font, "", 10, citation)
+        _pdf_set_font(pdf, cjk_font, "", 10)
         pdf.multi_cell(0, PDF_LINE_H, citation, fill=True)
 
-    try:
-        buf = BytesIO(pdf.output())
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-    buf.seek(0)
-    return send_file(
-        buf,
-        mimetype="application/pdf",
-        as_attachment=True,
-        download_name=f"research-report-{datetime.now(timezone.utc).strftime('%Y-%m-%d')}.pdf",
-    )
+    return _pdf_response(pdf, f"research-report-{today}.pdf")
 
 
 if __name__ == "__main__":